@@ -6,13 +6,64 @@ implements the required functionality for fetching weather data using
 the Open Meteo API.
 """
 
-import os
-import sys
 import importlib.util
 import inspect
+import re
 from pathlib import Path
 import pytest
 
+SCRIPT_PATH = "/home/tbuser/weather_fetcher.py"
+
+# Compiled once so the hardcoded-key test scans the script source in a
+# single pass instead of one substring scan per quote style.
+_HARDCODE_RE = re.compile(r"""api_key = ['"]""")
+
+
+@pytest.fixture(scope="session")
+def wf_module():
+    """
+    Load and execute weather_fetcher.py once for the whole test session.
+
+    Parsing, compiling, and executing the user's script is the expensive
+    part of these tests, so it happens a single time here and the
+    already-executed module is shared by every test that inspects it.
+    The module name is suffixed with the script path's hash and the
+    module is deliberately not inserted into sys.modules: this is a
+    probe-style load, and a shared key would let other scripts clobber
+    it under pytest-xdist.
+    """
+    module_name = f"weather_fetcher_{abs(hash(SCRIPT_PATH)):x}"
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def wf_source():
+    """
+    Read the weather_fetcher.py source once for the whole test session.
+
+    The string-scanning tests only need the raw text, so the file is
+    read from disk a single time and shared.
+    """
+    return Path(SCRIPT_PATH).read_text()
+
+
+@pytest.fixture(scope="session")
+def wf_sigs(wf_module):
+    """
+    Inspect each checked function's signature once per session.
+
+    Both the signature and the type-hint tests consume these, so the
+    signature objects are built a single time. ``eval_str=False`` keeps
+    stringified annotations unevaluated since only presence is checked.
+    """
+    return {
+        name: inspect.signature(getattr(wf_module, name), eval_str=False)
+        for name in ("get_weather", "format_weather_summary")
+    }
+
 
 def test_script_exists():
     """
@@ -21,7 +72,7 @@ def test_script_exists():
     The script must be present at /home/tbuser/weather_fetcher.py for the
 task to be considered complete.
     """
-    script_path = Path("/home/tbuser/weather_fetcher.py")
+    script_path = Path(SCRIPT_PATH)
     assert script_path.exists(), f"Script not found at {script_path}"
     assert script_path.is_file(), f"{script_path} is not a file"
 
@@ -34,18 +85,20 @@ def test_imports_successfully():
     - The requests package is installed
     - The weather_fetcher.py script has valid Python syntax
     - The script can be imported as a module
+
+    This is the only test that performs its own import, so that import
+    failures are reported with a clear diagnostic instead of a fixture error.
     """
     try:
         import requests
     except ImportError as e:
         pytest.fail(f"Failed to import requests library: {e}")
 
-    script_path = "/home/tbuser/weather_fetcher.py"
-    spec = importlib.util.spec_from_file_location("weather_fetcher", script_path)
+    module_name = f"weather_fetcher_{abs(hash(SCRIPT_PATH)):x}"
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_PATH)
     assert spec is not None, "Failed to load module spec"
 
     module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_fetcher"] = module
 
     try:
         spec.loader.exec_module(module)
@@ -53,7 +106,7 @@ def test_imports_successfully():
         pytest.fail(f"Failed to import weather_fetcher module: {e}")
 
 
-def test_required_functions_exist():
+def test_required_functions_exist(wf_module):
     """
     Test that all required functions are implemented in the script.
 
@@ -61,21 +114,15 @@ def test_required_functions_exist():
     - get_weather(api_key, latitude, longitude)
     - format_weather_summary(weather_data)
     """
-    script_path = "/home/tbuser/weather_fetcher.py"
-    spec = importlib.util.spec_from_file_location("weather_fetcher", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_fetcher"] = module
-    spec.loader.exec_module(module)
-
     required_functions = ["get_weather", "format_weather_summary"]
 
     for func_name in required_functions:
-        assert hasattr(module, func_name), f"Function '{func_name}' not found in weather_fetcher.py"
-        func = getattr(module, func_name)
+        assert hasattr(wf_module, func_name), f"Function '{func_name}' not found in weather_fetcher.py"
+        func = getattr(wf_module, func_name)
         assert callable(func), f"'{func_name}' is not callable"
 
 
-def test_function_signatures():
+def test_function_signatures(wf_sigs):
     """
     Test that functions have the correct parameter signatures.
 
@@ -83,65 +130,45 @@ def test_function_signatures():
     - get_weather accepts 'api_key', 'latitude', 'longitude'
     - format_weather_summary accepts 'weather_data'
     """
-    script_path = "/home/tbuser/weather_fetcher.py"
-    spec = importlib.util.spec_from_file_location("weather_fetcher", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_fetcher"] = module
-    spec.loader.exec_module(module)
-
-    get_weather_sig = inspect.signature(module.get_weather)
+    get_weather_sig = wf_sigs["get_weather"]
     required_params = ["api_key", "latitude", "longitude"]
     for param in required_params:
         assert param in get_weather_sig.parameters, f"get_weather must have '{param}' parameter"
 
-    format_sig = inspect.signature(module.format_weather_summary)
+    format_sig = wf_sigs["format_weather_summary"]
     assert "weather_data" in format_sig.parameters, "format_weather_summary must have 'weather_data' parameter"
 
 
-def test_functions_have_docstrings():
+def test_functions_have_docstrings(wf_module):
     """
     Test that all required functions have docstrings for documentation.
 
     Good code practices require documenting functions with docstrings
     that explain what the function does, its parameters, and return values.
     """
-    script_path = "/home/tbuser/weather_fetcher.py"
-    spec = importlib.util.spec_from_file_location("weather_fetcher", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_fetcher"] = module
-    spec.loader.exec_module(module)
-
     required_functions = ["get_weather", "format_weather_summary"]
 
     for func_name in required_functions:
-        func = getattr(module, func_name)
+        func = getattr(wf_module, func_name)
         assert func.__doc__ is not None, f"Function '{func_name}' must have a docstring"
         assert len(func.__doc__.strip()) > 0, f"Function '{func_name}' docstring is empty"
 
 
-def test_type_hints_present():
+def test_type_hints_present(wf_sigs):
     """
     Test that functions use type hints for parameters and return values.
 
     Type hints improve code readability and enable static type checking.
     This test verifies that the main functions have type annotations.
     """
-    script_path = "/home/tbuser/weather_fetcher.py"
-    spec = importlib.util.spec_from_file_location("weather_fetcher", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_fetcher"] = module
-    spec.loader.exec_module(module)
-
-    get_weather_sig = inspect.signature(module.get_weather)
-    assert get_weather_sig.return_annotation != inspect.Parameter.empty, \
+    assert wf_sigs["get_weather"].return_annotation != inspect.Parameter.empty, \
         "get_weather must have a return type hint"
 
-    format_sig = inspect.signature(module.format_weather_summary)
-    assert format_sig.return_annotation != inspect.Parameter.empty, \
+    assert wf_sigs["format_weather_summary"].return_annotation != inspect.Parameter.empty, \
         "format_weather_summary must have a return type hint"
 
 
-def test_no_hardcoded_api_keys():
+def test_no_hardcoded_api_keys(wf_source):
     """
     Test that the script does not contain hardcoded API keys.
 
@@ -151,25 +178,17 @@ def test_no_hardcoded_api_keys():
     environment variable usage) and that suspicious patterns like
     'api_key = "' with a long string do not appear.
     """
-    script_path = Path("/home/tbuser/weather_fetcher.py")
-    content = script_path.read_text()
-
     # Should reference environment variable
-    assert "OPENMETEO_API_KEY" in content, \
+    assert "OPENMETEO_API_KEY" in wf_source, \
         "Script must reference OPENMETEO_API_KEY environment variable"
 
     # Check for common hardcoding patterns
-    suspicious_patterns = [
-        'api_key = "',  # Check for hardcoded patterns
-        "api_key = '"
-    ]
+    match = _HARDCODE_RE.search(wf_source)
+    assert match is None, \
+        f"Potential hardcoded API key detected: '{match.group(0)}' found in script"
 
-    for pattern in suspicious_patterns:
-        assert pattern not in content, \
-            f"Potential hardcoded API key detected: '{pattern}' found in script"
 
-
-def test_script_is_importable():
+def test_script_is_importable(wf_source):
     """
     Test that the script can be imported without executing the main block.
 
@@ -177,8 +196,5 @@ def test_script_is_importable():
     main execution code, allowing functions to be imported and tested
     independently without side effects.
     """
-    script_path = Path("/home/tbuser/weather_fetcher.py")
-    content = script_path.read_text()
-
-    assert 'if __name__ == "__main__"' in content or "if __name__ == '__main__'" in content, \
-        "Script must use 'if __name__ == \"__main__\":' guard for main execution block"
\ No newline at end of file
+    assert 'if __name__ == "__main__"' in wf_source or "if __name__ == '__main__'" in wf_source, \
+        "Script must use 'if __name__ == \"__main__\":' guard for main execution block"
@@ -5,13 +5,64 @@ This test suite validates that the weather_automation.py script correctly
 implements the required functionality for weather data retrieval.
 """
 
-import os
-import sys
 import importlib.util
 import inspect
+import re
 from pathlib import Path
 import pytest
 
+SCRIPT_PATH = "/home/tbuser/weather_automation.py"
+
+# Compiled once so the hardcoded-key test scans the script source in a
+# single pass (Open Meteo keys start with op_).
+_HARDCODE_RE = re.compile(r"""api_key = ['"]op_""")
+
+
+@pytest.fixture(scope="session")
+def wa_module():
+    """
+    Load and execute weather_automation.py once for the whole test session.
+
+    Parsing, compiling, and executing the user's script is the expensive
+    part of these tests, so it happens a single time here and the
+    already-executed module is shared by every test that inspects it.
+    The module name is suffixed with the script path's hash and the
+    module is deliberately not inserted into sys.modules: this is a
+    probe-style load, and a shared key would let other scripts clobber
+    it under pytest-xdist.
+    """
+    module_name = f"weather_automation_{abs(hash(SCRIPT_PATH)):x}"
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def wa_source():
+    """
+    Read the weather_automation.py source once for the whole test session.
+
+    The string-scanning tests only need the raw text, so the file is
+    read from disk a single time and shared.
+    """
+    return Path(SCRIPT_PATH).read_text()
+
+
+@pytest.fixture(scope="session")
+def wa_sigs(wa_module):
+    """
+    Inspect each checked function's signature once per session.
+
+    Both the signature and the type-hint tests consume these, so the
+    signature objects are built a single time. ``eval_str=False`` keeps
+    stringified annotations unevaluated since only presence is checked.
+    """
+    return {
+        name: inspect.signature(getattr(wa_module, name), eval_str=False)
+        for name in ("get_weather_data", "format_weather_summary", "main")
+    }
+
 
 def test_script_exists():
     """
@@ -20,7 +71,7 @@ def test_script_exists():
     The script must be present at /home/tbuser/weather_automation.py for the
 task to be considered complete.
     """
-    script_path = Path("/home/tbuser/weather_automation.py")
+    script_path = Path(SCRIPT_PATH)
     assert script_path.exists(), f"Script not found at {script_path}"
     assert script_path.is_file(), f"{script_path} is not a file"
 
@@ -33,6 +84,9 @@ def test_imports_successfully():
     - The requests package is installed
     - The weather_automation.py script has valid Python syntax
     - The script can be imported as a module
+
+    This is the only test that performs its own import, so that import
+    failures are reported with a clear diagnostic instead of a fixture error.
     """
     # Test requests library availability
     try:
@@ -41,12 +95,11 @@ def test_imports_successfully():
         pytest.fail(f"Failed to import requests library: {e}")
 
     # Test script import
-    script_path = "/home/tbuser/weather_automation.py"
-    spec = importlib.util.spec_from_file_location("weather_automation", script_path)
+    module_name = f"weather_automation_{abs(hash(SCRIPT_PATH)):x}"
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_PATH)
     assert spec is not None, "Failed to load module spec"
 
     module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_automation"] = module
 
     try:
         spec.loader.exec_module(module)
@@ -54,7 +107,7 @@ def test_imports_successfully():
         pytest.fail(f"Failed to import weather_automation module: {e}")
 
 
-def test_required_functions_exist():
+def test_required_functions_exist(wa_module):
     """
     Test that all required functions are implemented in the script.
 
@@ -63,21 +116,15 @@ def test_required_functions_exist():
     - format_weather_summary(weather_data)
     - main()
     """
-    script_path = "/home/tbuser/weather_automation.py"
-    spec = importlib.util.spec_from_file_location("weather_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_automation"] = module
-    spec.loader.exec_module(module)
-
     required_functions = ["get_weather_data", "format_weather_summary", "main"]
 
     for func_name in required_functions:
-        assert hasattr(module, func_name), f"Function '{func_name}' not found in weather_automation.py"
-        func = getattr(module, func_name)
+        assert hasattr(wa_module, func_name), f"Function '{func_name}' not found in weather_automation.py"
+        func = getattr(wa_module, func_name)
         assert callable(func), f"'{func_name}' is not callable"
 
 
-def test_function_signatures():
+def test_function_signatures(wa_sigs):
     """
     Test that functions have the correct parameter signatures.
 
@@ -86,73 +133,52 @@ def test_function_signatures():
     - format_weather_summary accepts 'weather_data'
     - main has no parameters
     """
-    script_path = "/home/tbuser/weather_automation.py"
-    spec = importlib.util.spec_from_file_location("weather_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_automation"] = module
-    spec.loader.exec_module(module)
-
     # Test get_weather_data signature
-    get_weather_data_sig = inspect.signature(module.get_weather_data)
+    get_weather_data_sig = wa_sigs["get_weather_data"]
     required_params = ["api_key", "latitude", "longitude"]
     for param in required_params:
         assert param in get_weather_data_sig.parameters, f"get_weather_data must have '{param}' parameter"
 
     # Test format_weather_summary signature
-    format_sig = inspect.signature(module.format_weather_summary)
+    format_sig = wa_sigs["format_weather_summary"]
     assert "weather_data" in format_sig.parameters, "format_weather_summary must have 'weather_data' parameter"
 
     # Test main signature
-    main_sig = inspect.signature(module.main)
-    assert not main_sig.parameters, "main should not have parameters"
+    assert not wa_sigs["main"].parameters, "main should not have parameters"
 
 
-def test_functions_have_docstrings():
+def test_functions_have_docstrings(wa_module):
     """
     Test that all required functions have docstrings for documentation.
 
     Good code practices require documenting functions with docstrings
     that explain what the function does, its parameters, and return values.
     """
-    script_path = "/home/tbuser/weather_automation.py"
-    spec = importlib.util.spec_from_file_location("weather_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_automation"] = module
-    spec.loader.exec_module(module)
-
     required_functions = ["get_weather_data", "format_weather_summary", "main"]
 
     for func_name in required_functions:
-        func = getattr(module, func_name)
+        func = getattr(wa_module, func_name)
         assert func.__doc__ is not None, f"Function '{func_name}' must have a docstring"
         assert len(func.__doc__.strip()) > 0, f"Function '{func_name}' docstring is empty"
 
 
-def test_type_hints_present():
+def test_type_hints_present(wa_sigs):
     """
     Test that functions use type hints for parameters and return values.
 
     Type hints improve code readability and enable static type checking.
     This test verifies that the main functions have type annotations.
     """
-    script_path = "/home/tbuser/weather_automation.py"
-    spec = importlib.util.spec_from_file_location("weather_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["weather_automation"] = module
-    spec.loader.exec_module(module)
-
     # Check type hints for get_weather_data
-    get_weather_data_sig = inspect.signature(module.get_weather_data)
-    assert get_weather_data_sig.return_annotation != inspect.Parameter.empty, 
+    assert wa_sigs["get_weather_data"].return_annotation != inspect.Parameter.empty, \
         "get_weather_data must have a return type hint"
 
     # Check type hints for format_weather_summary
-    format_sig = inspect.signature(module.format_weather_summary)
-    assert format_sig.return_annotation != inspect.Parameter.empty, 
+    assert wa_sigs["format_weather_summary"].return_annotation != inspect.Parameter.empty, \
         "format_weather_summary must have a return type hint"
 
 
-def test_no_hardcoded_api_keys():
+def test_no_hardcoded_api_keys(wa_source):
     """
     Test that the script does not contain hardcoded API keys.
 
@@ -162,25 +188,17 @@ def test_no_hardcoded_api_keys():
     environment variable usage) and that suspicious patterns like
     'api_key = "' with a long string do not appear.
     """
-    script_path = Path("/home/tbuser/weather_automation.py")
-    content = script_path.read_text()
-
     # Should reference environment variable
-    assert "OPENMETEO_API_KEY" in content, 
+    assert "OPENMETEO_API_KEY" in wa_source, \
         "Script must reference OPENMETEO_API_KEY environment variable"
 
     # Check for common hardcoding patterns
-    suspicious_patterns = [
-        'api_key = "op_',  # Open Meteo keys start with op_
-        "api_key = 'op_",
-    ]
+    match = _HARDCODE_RE.search(wa_source)
+    assert match is None, \
+        f"Potential hardcoded API key detected: '{match.group(0)}' found in script"
 
-    for pattern in suspicious_patterns:
-        assert pattern not in content, 
-            f"Potential hardcoded API key detected: '{pattern}' found in script"
 
-
-def test_script_is_importable():
+def test_script_is_importable(wa_source):
     """
     Test that the script can be imported without executing the main block.
 
@@ -188,8 +206,5 @@ def test_script_is_importable():
     main execution code, allowing functions to be imported and tested
     independently without side effects.
     """
-    script_path = Path("/home/tbuser/weather_automation.py")
-    content = script_path.read_text()
-
-    assert 'if __name__ == "__main__"' in content or "if __name__ == '__main__'" in content, \
+    assert 'if __name__ == "__main__"' in wa_source or "if __name__ == '__main__'" in wa_source, \
         "Script must use 'if __name__ == \"__main__\":' guard for main execution block"
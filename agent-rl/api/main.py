@@ -1,27 +1,39 @@
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from pipeline_api import router as pipeline_router
 
-# Load environment variables from .env file
-env_path = Path(__file__).parent / ".env"
-if env_path.exists():
-    load_dotenv(dotenv_path=env_path)
-    print(f"✅ Loaded environment variables from {env_path}")
-    # Check if required key is set
-    if os.getenv("OPENAI_API_KEY"):
-        print("   ✓ OPENAI_API_KEY is set")
+
+def _load_env() -> None:
+    """Load environment variables from .env file (deferred so importing
+    the module, e.g. during test collection, stays side-effect free)."""
+    from dotenv import load_dotenv
+
+    env_path = Path(__file__).parent / ".env"
+    if env_path.exists():
+        load_dotenv(dotenv_path=env_path)
+        print(f"✅ Loaded environment variables from {env_path}")
+        # Check if required key is set
+        if os.getenv("OPENAI_API_KEY"):
+            print("   ✓ OPENAI_API_KEY is set")
+        else:
+            print("   ⚠️  OPENAI_API_KEY not found")
     else:
-        print("   ⚠️  OPENAI_API_KEY not found")
-else:
-    print(f"⚠️  .env file not found at {env_path}")
-    print("   API keys should be set via environment variables")
+        print(f"⚠️  .env file not found at {env_path}")
+        print("   API keys should be set via environment variables")
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    _load_env()
+    yield
+
 
-app = FastAPI(title="Agent Gym")
+app = FastAPI(title="Agent Gym", lifespan=_lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -43,4 +55,7 @@ app.include_router(pipeline_router)
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop + httptools noticeably outperform the default asyncio loop
+    # and h11 parser on this workload (many small SSE writes plus
+    # concurrent outbound LLM calls)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="uvloop", http="httptools")
@@ -5,15 +5,20 @@ This simplified architecture uses async generators to stream progress updates in
 eliminating the need for background tasks, polling, and complex state management.
 """
 
-import json
+import asyncio
+import logging
+import os
 import shutil
+import tempfile
 import time
 import zipfile
 from pathlib import Path
 from typing import Any
+from uuid import uuid4
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import StreamingResponse
+import orjson
+from fastapi import APIRouter, File, Header, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from task_generator import TaskGenerator
@@ -21,17 +26,136 @@ from task_schema import GeneratedTask
 
 router = APIRouter(prefix="/api", tags=["pipeline"])
 
-# Simplified state (only for uploaded seeds and config)
-state: dict[str, Any] = {
-    "seed_task_path": None,
-    "scenario": None,
-    "config": {"total_tasks": 10, "parallelism": 3},
-}
+logger = logging.getLogger(__name__)
+
+
+class PipelineSession:
+    """Per-client pipeline state (uploaded seed and scenario config).
+
+    Replaces the old module-global state dict so concurrent clients no
+    longer race on each other's seed/scenario and the module stops being
+    a single-worker bottleneck.
+    """
+
+    __slots__ = ("seed_task_path", "scenario", "config")
+
+    def __init__(self) -> None:
+        self.seed_task_path: str | None = None
+        self.scenario: str | None = None
+        self.config: dict[str, Any] = {"total_tasks": 10, "parallelism": 3}
+
+
+# Sessions keyed by the X-Session-ID header; clients that don't send one
+# share the "default" session, preserving the previous behavior.
+_sessions: dict[str, PipelineSession] = {}
+_sessions_lock = asyncio.Lock()
+
+
+async def get_or_create_session(session_id: str) -> PipelineSession:
+    """Fetch the session for session_id, creating it on first use."""
+    async with _sessions_lock:
+        session = _sessions.get(session_id)
+        if session is None:
+            session = _sessions[session_id] = PipelineSession()
+        return session
+
 
 # Output directory for generated tasks
 GENERATED_TASKS_DIR = Path(__file__).parent / "generated_tasks"
 GENERATED_TASKS_DIR.mkdir(exist_ok=True)
 
+# Uploaded seed tasks are extracted into a per-upload staging dir and
+# published atomically; any staging dirs orphaned by a crash are swept
+# here at startup.
+UPLOAD_DIR = Path("/tmp/agent-rl-uploads")
+UPLOAD_DIR.mkdir(exist_ok=True)
+for _stale in UPLOAD_DIR.glob(".staging-*"):
+    shutil.rmtree(_stale, ignore_errors=True)
+
+# Uploads up to this size are spooled in memory and never touch disk
+_UPLOAD_SPOOL_MAX = 64 * 1024 * 1024
+
+# SSE comment emitted while no task has finished for a while, so proxies
+# don't time out an idle stream; clients ignore comment frames.
+_KEEPALIVE_INTERVAL = 15.0
+_KEEPALIVE_FRAME = b": keep-alive\n\n"
+
+# Progress frames are emitted once per completed task; the constant
+# fragments are built once here so the hot path only joins byte slices
+# instead of re-serializing an identical-shape dict every time.
+_PROGRESS_PREFIX = b'data: {"type": "progress", "current": '
+_PROGRESS_TOTAL = b', "total": '
+_PROGRESS_MESSAGE = b', "message": "Progress: '
+_PROGRESS_SUFFIX = b'"}\n\n'
+
+
+def _write_json(path: Path, data: bytes) -> None:
+    """Blocking write of a generated task's JSON file (run in a thread)."""
+    path.write_bytes(data)
+
+
+# Fixed-schema frames are rendered through byte templates: no dict, no
+# JSON encoder, just %-formatting of integers into pre-encoded bytes.
+_START_TMPL = (
+    'data: {"type": "start", "total": %d, "message": '
+    '"🎨 Starting task generation (parallelism: %d)"}\n\n'
+).encode()
+_SCHEDULED_TMPL = (
+    'data: {"type": "info", "message": "🚀 Generating %d tasks (%d in parallel)..."}\n\n'
+).encode()
+_COMPLETE_TMPL = (
+    'data: {"type": "complete", "generated": %d, "total": %d, '
+    '"message": "🎉 Generation completed!"}\n\n'
+).encode()
+_INFO_PREFIX = b'data: {"type": "info", "message": "'
+_ERROR_PREFIX = b'data: {"type": "error", "message": "'
+_MSG_SUFFIX = b'"}\n\n'
+
+
+def _json_escape(text: str) -> str:
+    """Escape message text for embedding inside a JSON string literal."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\t", "\\t")
+    )
+
+
+def _sse(payload: dict[str, Any]) -> bytes:
+    """Serialize one SSE data frame to bytes ready for the wire."""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def _sse_info(message: str) -> bytes:
+    """Build an info frame without dict or JSON-encoder overhead."""
+    return _INFO_PREFIX + _json_escape(message).encode() + _MSG_SUFFIX
+
+
+def _sse_error(message: str) -> bytes:
+    """Build an error frame without dict or JSON-encoder overhead."""
+    return _ERROR_PREFIX + _json_escape(message).encode() + _MSG_SUFFIX
+
+
+def _sse_progress(current: int, total: int) -> bytes:
+    """Build a progress frame from precomputed fragments."""
+    current_b = str(current).encode()
+    total_b = str(total).encode()
+    return b"".join(
+        (
+            _PROGRESS_PREFIX,
+            current_b,
+            _PROGRESS_TOTAL,
+            total_b,
+            _PROGRESS_MESSAGE,
+            current_b,
+            b"/",
+            total_b,
+            _PROGRESS_SUFFIX,
+        )
+    )
+
 
 class ScenarioSubmission(BaseModel):
     """Agent task scenario submission"""
@@ -51,10 +175,14 @@ class GenerationRequest(BaseModel):
 
 
 @router.post("/submit-scenario")
-async def submit_scenario(submission: ScenarioSubmission):
+async def submit_scenario(
+    submission: ScenarioSubmission,
+    session_id: str = Header(default="default", alias="X-Session-ID"),
+):
     """Submit agent task scenario and configuration"""
-    state["scenario"] = submission.scenario
-    state["config"] = submission.config
+    session = await get_or_create_session(session_id)
+    session.scenario = submission.scenario
+    session.config = submission.config
     return {
         "status": "success",
         "message": "Scenario submitted successfully",
@@ -63,103 +191,142 @@ async def submit_scenario(submission: ScenarioSubmission):
 
 
 @router.post("/upload-seed-tasks")
-async def upload_seed_tasks(file: UploadFile = File(...)):
+async def upload_seed_tasks(
+    file: UploadFile = File(...),
+    session_id: str = Header(default="default", alias="X-Session-ID"),
+):
     """Upload seed tasks zip file"""
+    session = await get_or_create_session(session_id)
     if not file.filename or not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Only .zip files are accepted")
 
-    # Save and extract uploaded file
-    upload_dir = Path("/tmp/agent-rl-uploads")
-    upload_dir.mkdir(exist_ok=True)
-
-    file_path = upload_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # Extract the zip file
-    extract_dir = upload_dir / file.filename.replace(".zip", "")
-    if extract_dir.exists():
-        shutil.rmtree(extract_dir)
-    extract_dir.mkdir(exist_ok=True)
+    # Per-upload staging dir, atomically published on success, so
+    # concurrent uploads of the same file never race each other
+    staging_dir = UPLOAD_DIR / f".staging-{uuid4().hex}"
 
     try:
-        with zipfile.ZipFile(file_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
-
-        # Find the task directory (should contain task.yaml)
-        task_dirs = list(extract_dir.rglob("task.yaml"))
-        if not task_dirs:
+        # Spool the upload in memory (disk only beyond _UPLOAD_SPOOL_MAX);
+        # UploadFile.read is async so the event loop keeps serving
+        with tempfile.SpooledTemporaryFile(max_size=_UPLOAD_SPOOL_MAX) as tmp:
+            file_size = 0
+            while chunk := await file.read(1 << 20):
+                tmp.write(chunk)
+                file_size += len(chunk)
+
+            def _extract_seed_dir() -> str | None:
+                """Locate the first task.yaml entry and extract only the
+                files under its task directory (blocking; run in a
+                thread). Returns the seed path inside the staging dir,
+                or None if the zip has no task.yaml."""
+                tmp.seek(0)
+                with zipfile.ZipFile(tmp) as zip_ref:
+                    infos = zip_ref.infolist()
+                    prefix = None
+                    for info in infos:
+                        if info.filename == "task.yaml" or info.filename.endswith("/task.yaml"):
+                            prefix = info.filename[: -len("task.yaml")]
+                            break
+                    if prefix is None:
+                        return None
+                    members = [i for i in infos if i.filename.startswith(prefix)]
+                    zip_ref.extractall(staging_dir, members=members)
+                return str(staging_dir / prefix) if prefix else str(staging_dir)
+
+            extracted = await asyncio.to_thread(_extract_seed_dir)
+
+        if extracted is None:
             raise HTTPException(
                 status_code=400, detail="Invalid seed task: task.yaml not found in the zip file"
             )
 
-        seed_task_path = task_dirs[0].parent
+        staged_seed_path = Path(extracted)
 
         # Validate required files
         required_files = ["task.yaml", "Dockerfile"]
         for req_file in required_files:
-            if not (seed_task_path / req_file).exists():
+            if not (staged_seed_path / req_file).exists():
                 raise HTTPException(
                     status_code=400, detail=f"Invalid seed task: {req_file} not found"
                 )
 
         # Validate tests directory
-        if not (seed_task_path / "tests").exists():
+        if not (staged_seed_path / "tests").exists():
             raise HTTPException(
                 status_code=400, detail="Invalid seed task: tests/ directory not found"
             )
 
-        state["seed_task_path"] = str(seed_task_path)
+        # Publish the validated tree atomically under its final name
+        extract_dir = UPLOAD_DIR / file.filename.replace(".zip", "")
+        if extract_dir.exists():
+            shutil.rmtree(extract_dir)
+        os.replace(staging_dir, extract_dir)
+        seed_task_path = extract_dir / staged_seed_path.relative_to(staging_dir)
+
+        session.seed_task_path = str(seed_task_path)
 
         return {
             "status": "success",
             "message": f"Uploaded and extracted {file.filename}",
-            "file_size": file_path.stat().st_size,
+            "file_size": file_size,
             "seed_task_path": str(seed_task_path),
         }
 
     except zipfile.BadZipFile:
         raise HTTPException(status_code=400, detail="Invalid zip file")
+    except HTTPException:
+        # Validation errors above already carry the right status code
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing upload: {str(e)}")
-
-
-async def generate_tasks_stream(num_tasks: int, parallelism: int = 3, model: str = "gpt-5"):
+    finally:
+        # Gone already when os.replace published it; only failures leave it
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+async def generate_tasks_stream(
+    session: PipelineSession,
+    num_tasks: int,
+    parallelism: int = 3,
+    model: str = "gpt-5",
+    http_request: Request | None = None,
+):
     """
     Async generator that yields progress updates as Server-Sent Events.
     Supports parallel task generation for improved performance.
     """
-    import asyncio
-    import logging
-
-    logger = logging.getLogger(__name__)
-
     # Use default seed task if none uploaded
-    seed_task_path: str | None = state.get("seed_task_path")
+    seed_task_path: str | None = session.seed_task_path
     if not seed_task_path:
         default_seed = Path(__file__).parent.parent / "example_seeds" / "email-automation-agentmail"
         if default_seed.exists():
             seed_task_path = str(default_seed)
-            yield f"data: {json.dumps({'type': 'info', 'message': 'Using default seed task'})}\n\n"
+            yield _sse_info("Using default seed task")
         else:
-            yield f"data: {json.dumps({'type': 'error', 'message': 'No seed task found'})}\n\n"
+            yield _sse_error("No seed task found")
             return
 
-    yield f"data: {json.dumps({'type': 'start', 'total': num_tasks, 'message': f'🎨 Starting task generation (parallelism: {parallelism})'})}\n\n"
+    yield _START_TMPL % (num_tasks, parallelism)
 
-    # Initialize generator
+    # Initialize generator and build the shared prompt prefix once; the
+    # per-task calls only append their variation request to it
     try:
         generator = TaskGenerator(model=model)
-        yield f"data: {json.dumps({'type': 'info', 'message': '⚙️ TaskGenerator initialized'})}\n\n"
+        system_prompt, user_prompt_prefix = await generator.prepare_prefix(seed_task_path)
+        yield _sse_info("⚙️ TaskGenerator initialized")
     except Exception as e:
-        yield f"data: {json.dumps({'type': 'error', 'message': f'Failed to initialize: {str(e)}'})}\n\n"
+        yield _sse_error(f"Failed to initialize: {str(e)}")
         return
 
     generated_tasks = []
     completed_count = 0  # Track completed tasks for accurate progress
+    pending_writes: list[asyncio.Task] = []  # Background JSON file writes
 
     # Get user scenario for context
-    user_scenario = state.get("scenario", "")
+    user_scenario = session.scenario or ""
+
+    # Bound concurrency with a semaphore instead of fixed batches, so a
+    # slow LLM call only occupies one slot instead of stalling a batch
+    sem = asyncio.Semaphore(parallelism)
 
     # Generate single task with variation
     async def generate_single_task(task_num: int):
@@ -185,43 +352,69 @@ Requirements:
 
 CRITICAL: Ensure task_name is unique and descriptive!"""
 
-            generated_task: GeneratedTask = await generator.generate_from_seed(
-                seed_task_path=seed_task_path, variation_prompt=variation_prompt
-            )
+            async with sem:
+                generated_task: GeneratedTask = await generator.generate_from_prefix(
+                    system_prompt, user_prompt_prefix, variation_prompt=variation_prompt
+                )
             return (task_num, generated_task, None)
         except Exception as e:
             return (task_num, None, e)
 
-    # Generate tasks in parallel batches
-    for batch_start in range(1, num_tasks + 1, parallelism):
-        batch_end = min(batch_start + parallelism, num_tasks + 1)
-        batch_size = batch_end - batch_start
+    # Schedule everything up front; the semaphore caps in-flight LLM calls
+    tasks = [asyncio.create_task(generate_single_task(i)) for i in range(1, num_tasks + 1)]
 
-        yield f"data: {json.dumps({'type': 'info', 'message': f'🚀 Processing batch {batch_start}-{batch_end-1} ({batch_size} tasks in parallel)...'})}\n\n"
+    # A disconnected client shouldn't keep burning LLM quota: watch the
+    # connection and cancel the pending generations the moment it drops.
+    # (asyncio.TaskGroup would structure this more tightly, but the
+    # package still supports Python 3.10.)
+    watchdog: asyncio.Task | None = None
+    if http_request is not None:
 
-        # Create parallel tasks
-        tasks = [generate_single_task(i) for i in range(batch_start, batch_end)]
+        async def _watch_disconnect() -> None:
+            while not await http_request.is_disconnected():
+                await asyncio.sleep(1.0)
+            for task in tasks:
+                task.cancel()
 
-        # Wait for all tasks in batch to complete
-        results = await asyncio.gather(*tasks)
+        watchdog = asyncio.create_task(_watch_disconnect())
 
-        # Process results
-        for task_num, generated_task, error in results:
+    yield _SCHEDULED_TMPL % (num_tasks, parallelism)
+
+    # Emit events the moment each task finishes instead of per batch.
+    # If the client disconnects the generator is closed mid-await, so
+    # make sure the still-pending generations are cancelled with it.
+    try:
+        for fut in asyncio.as_completed(tasks):
+            fut = asyncio.ensure_future(fut)
+            while True:
+                try:
+                    task_num, generated_task, error = await asyncio.wait_for(
+                        asyncio.shield(fut), timeout=_KEEPALIVE_INTERVAL
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    yield _KEEPALIVE_FRAME
             completed_count += 1  # Increment for each task (success or error)
             if error:
                 logger.error(f"Error generating task {task_num}: {error}")
-                yield f"data: {json.dumps({'type': 'error', 'message': f'❌ Task {task_num} failed: {str(error)[:200]}'})}\n\n"
-                # Send progress update
-                yield f"data: {json.dumps({'type': 'progress', 'current': completed_count, 'total': num_tasks, 'message': f'Progress: {completed_count}/{num_tasks}'})}\n\n"
+                # One write per completed task: error + progress coalesced
+                yield _sse_error(f"❌ Task {task_num} failed: {str(error)[:200]}") + _sse_progress(completed_count, num_tasks)
                 continue
 
             if not generated_task:
                 continue
 
+            # Serialize the task YAML once through pydantic-core's Rust
+            # encoder; orjson embeds the raw fragment without a dict
+            # materialization or a second encoding pass
+            task_yaml_bytes = generated_task.task_yaml.__pydantic_serializer__.to_json(
+                generated_task.task_yaml
+            )
+
             # Save task as JSON only (simplified)
             task_json = {
                 "task_name": generated_task.task_name,
-                "task_yaml": generated_task.task_yaml.model_dump(),
+                "task_yaml": orjson.Fragment(task_yaml_bytes),
                 "dockerfile": generated_task.dockerfile,
                 "docker_compose": generated_task.docker_compose,
                 "solution_script": generated_task.solution_script,
@@ -229,12 +422,21 @@ CRITICAL: Ensure task_name is unique and descriptive!"""
                 "test_file_content": generated_task.test_file_content,
             }
 
-            # Save JSON file
+            # Save JSON file in the background so the success event isn't
+            # held up by disk latency; awaited before the complete event
             json_filename = f"{generated_task.task_name}_{task_num:03d}.json"
             json_path = GENERATED_TASKS_DIR / json_filename
-            with open(json_path, "w") as f:
-                json.dump(task_json, f, indent=2)
+            pending_writes.append(
+                asyncio.create_task(
+                    asyncio.to_thread(
+                        _write_json, json_path, orjson.dumps(task_json, option=orjson.OPT_INDENT_2)
+                    )
+                )
+            )
 
+            # Metadata only: the full task body stays on disk and is
+            # served by GET /api/tasks/{filename}, keeping SSE frames
+            # small and the per-stream memory bounded
             task_info = {
                 "id": task_num,
                 "name": generated_task.task_name,
@@ -243,20 +445,35 @@ CRITICAL: Ensure task_name is unique and descriptive!"""
                 "tags": generated_task.task_yaml.tags,
                 "instruction": generated_task.task_yaml.instruction,
                 "json_path": str(json_path),
-                "task_json": task_json,  # Include full task data
+                "json_filename": json_filename,
             }
             generated_tasks.append(task_info)
 
-            # Send success event with updated progress
-            yield f"data: {json.dumps({'type': 'success', 'task': task_info, 'message': f'✅ Generated: {generated_task.task_name}'})}\n\n"
-            yield f"data: {json.dumps({'type': 'progress', 'current': completed_count, 'total': num_tasks, 'message': f'Progress: {completed_count}/{num_tasks}'})}\n\n"
+            # One write per completed task: success + progress coalesced
+            yield _sse({"type": "success", "task": task_info, "message": f"✅ Generated: {generated_task.task_name}"}) + _sse_progress(completed_count, num_tasks)
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        for task in tasks:
+            task.cancel()
+
+    # Make sure the background disk writes landed before declaring completion
+    if pending_writes:
+        write_results = await asyncio.gather(*pending_writes, return_exceptions=True)
+        for result in write_results:
+            if isinstance(result, Exception):
+                yield _sse_error(f"Failed to write task JSON: {result}")
 
     # Send completion event
-    yield f"data: {json.dumps({'type': 'complete', 'generated': len(generated_tasks), 'total': num_tasks, 'message': '🎉 Generation completed!'})}\n\n"
+    yield _COMPLETE_TMPL % (len(generated_tasks), num_tasks)
 
 
 @router.post("/generate-tasks-stream")
-async def generate_tasks_endpoint(request: GenerationRequest):
+async def generate_tasks_endpoint(
+    request: GenerationRequest,
+    http_request: Request,
+    session_id: str = Header(default="default", alias="X-Session-ID"),
+):
     """
     Stream task generation progress using Server-Sent Events (SSE).
 
@@ -267,8 +484,15 @@ async def generate_tasks_endpoint(request: GenerationRequest):
     - Errors are immediately visible
     - Automatic cleanup when client disconnects
     """
+    session = await get_or_create_session(session_id)
     return StreamingResponse(
-        generate_tasks_stream(request.num_tasks, request.parallelism, request.model),
+        generate_tasks_stream(
+            session,
+            request.num_tasks,
+            request.parallelism,
+            request.model,
+            http_request=http_request,
+        ),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -278,11 +502,25 @@ async def generate_tasks_endpoint(request: GenerationRequest):
     )
 
 
+@router.get("/tasks/{filename}")
+async def get_task_json(filename: str):
+    """Serve a generated task's JSON file by filename"""
+    if "/" in filename or "\\" in filename or not filename.endswith(".json"):
+        raise HTTPException(status_code=400, detail="Invalid task filename")
+
+    json_path = GENERATED_TASKS_DIR / filename
+    if not json_path.is_file():
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return FileResponse(json_path, media_type="application/json")
+
+
 @router.get("/status")
-async def get_status():
+async def get_status(session_id: str = Header(default="default", alias="X-Session-ID")):
     """Get current configuration status"""
+    session = await get_or_create_session(session_id)
     return {
-        "scenario_submitted": state["scenario"] is not None,
-        "seed_task_uploaded": state["seed_task_path"] is not None,
-        "seed_task_path": state["seed_task_path"],
+        "scenario_submitted": session.scenario is not None,
+        "seed_task_uploaded": session.seed_task_path is not None,
+        "seed_task_path": session.seed_task_path,
     }
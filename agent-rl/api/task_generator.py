@@ -2,14 +2,135 @@
 LLM-based task generator using structured outputs.
 """
 
+import asyncio
+import atexit
+import logging
 import os
+from dataclasses import dataclass
 from pathlib import Path
 
+import httpx
 import yaml
-from openai import AsyncOpenAI
+from openai import APIError, APITimeoutError, AsyncOpenAI
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from task_schema import GeneratedTask
 
+try:
+    # libyaml-backed dumper; the pure-Python one is ~40x slower
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+
+logger = logging.getLogger(__name__)
+
+# Pool sized for the API's parallelism cap (GenerationRequest allows up
+# to 10 concurrent generations) with headroom, so parallel LLM calls
+# never queue on connection slots.
+_MAX_POOL_CONNECTIONS = 20
+
+# One client for the whole process: connections (and their TLS
+# handshakes) are reused across streams instead of being re-established
+# per TaskGenerator instance.
+_client: AsyncOpenAI | None = None
+
+
+def get_client() -> AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=_MAX_POOL_CONNECTIONS,
+                    max_keepalive_connections=_MAX_POOL_CONNECTIONS,
+                ),
+                http2=True,
+            ),
+        )
+        atexit.register(_close_client)
+    return _client
+
+
+def _close_client() -> None:
+    """Close the shared client's pool at interpreter shutdown."""
+    if _client is not None:
+        try:
+            asyncio.run(_client.close())
+        except RuntimeError:
+            # Event loop already torn down; sockets die with the process
+            pass
+
+
+@dataclass(frozen=True)
+class SeedBundle:
+    """Seed task file contents plus the pre-rendered YAML text for prompts."""
+
+    task_yaml: dict
+    dockerfile: str
+    solution: str
+    test: str
+    yaml_dump_str: str
+
+
+def _seed_mtime_ns(seed_path: Path) -> int:
+    """Newest modification time across the four seed files (cache key)."""
+    return max(
+        (seed_path / name).stat().st_mtime_ns
+        for name in ("task.yaml", "Dockerfile", "solution.sh", "tests/test_outputs.py")
+    )
+
+
+def _build_bundle(yaml_text: str, dockerfile: str, solution: str, test: str) -> SeedBundle:
+    """Parse and pre-render the seed YAML (CPU-bound; run in a thread)."""
+    task_yaml = yaml.safe_load(yaml_text)
+    return SeedBundle(
+        task_yaml=task_yaml,
+        dockerfile=dockerfile,
+        solution=solution,
+        test=test,
+        yaml_dump_str=yaml.dump(task_yaml, default_flow_style=False, Dumper=_YamlDumper),
+    )
+
+
+# Seeds cached by (path, mtime) — bounded like the lru_cache it replaces
+_SEED_CACHE_MAX = 32
+_seed_cache: dict[tuple[str, int], SeedBundle] = {}
+
+
+async def _load_seed_bundle(seed_path: Path) -> SeedBundle:
+    """
+    Load a seed task once per (path, mtime) and keep it resident.
+
+    A generation stream builds its prompt prefix from the same seed for
+    every task, so this turns O(num_tasks) file reads and YAML
+    round-trips into O(1) per unique seed; editing any seed file bumps
+    the mtime key and naturally invalidates the entry. On a miss the
+    four files are read in parallel worker threads, so cold-cache wall
+    time is bounded by the slowest file rather than their sum.
+    """
+    mtime_ns = await asyncio.to_thread(_seed_mtime_ns, seed_path)
+    key = (str(seed_path), mtime_ns)
+    bundle = _seed_cache.get(key)
+    if bundle is None:
+        yaml_text, dockerfile, solution, test = await asyncio.gather(
+            asyncio.to_thread((seed_path / "task.yaml").read_text),
+            asyncio.to_thread((seed_path / "Dockerfile").read_text),
+            asyncio.to_thread((seed_path / "solution.sh").read_text),
+            asyncio.to_thread((seed_path / "tests" / "test_outputs.py").read_text),
+        )
+        bundle = await asyncio.to_thread(_build_bundle, yaml_text, dockerfile, solution, test)
+        if len(_seed_cache) >= _SEED_CACHE_MAX:
+            _seed_cache.pop(next(iter(_seed_cache)))
+        _seed_cache[key] = bundle
+    return bundle
+
 
 class TaskGenerator:
     """Generates programming tasks using LLM with structured outputs."""
@@ -22,7 +143,29 @@ class TaskGenerator:
             model: OpenAI model to use for generation (e.g., "gpt-5", "gpt-4o")
         """
         self.model = model
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = get_client()
+
+    async def prepare_prefix(self, seed_task_path: str) -> tuple[str, str]:
+        """
+        Build the prompt prefix shared by every variation of a seed.
+
+        Returns (system_prompt, user_prompt_prefix). All seed-derived
+        content sits in the prefix and the per-task variation request is
+        appended at the very end, so the N parallel calls of a stream
+        share an identical leading span and OpenAI's automatic prompt
+        caching can deduplicate it server-side.
+
+        Args:
+            seed_task_path: Path to the seed task directory
+        """
+        # Read seed task files
+        seed_path = Path(seed_task_path)
+
+        logger.info("[TaskGenerator] Loading seed task files...")
+        # Load seed task content off the event loop (cached per mtime)
+        seed = await _load_seed_bundle(seed_path)
+
+        return self._build_system_prompt(), self._build_user_prompt_prefix(seed)
 
     async def generate_from_seed(
         self, seed_task_path: str, variation_prompt: str | None = None
@@ -30,6 +173,10 @@ class TaskGenerator:
         """
         Generate a new task based on a seed task.
 
+        Convenience wrapper that builds the prompt prefix and delegates;
+        batch callers should call prepare_prefix once and use
+        generate_from_prefix per task instead.
+
         Args:
             seed_task_path: Path to the seed task directory
             variation_prompt: Optional specific variation request
@@ -37,72 +184,72 @@ class TaskGenerator:
         Returns:
             GeneratedTask with all required files
         """
-        import logging
+        system_prompt, user_prompt_prefix = await self.prepare_prefix(seed_task_path)
+        return await self.generate_from_prefix(system_prompt, user_prompt_prefix, variation_prompt)
 
-        logger = logging.getLogger(__name__)
-        logger.info(f"[TaskGenerator] Starting generation from seed: {seed_task_path}")
+    async def generate_from_prefix(
+        self,
+        system_prompt: str,
+        user_prompt_prefix: str,
+        variation_prompt: str | None = None,
+    ) -> GeneratedTask:
+        """
+        Generate a task from a prepared prompt prefix.
 
-        # Read seed task files
-        seed_path = Path(seed_task_path)
-        task_yaml_path = seed_path / "task.yaml"
-        dockerfile_path = seed_path / "Dockerfile"
-        solution_path = seed_path / "solution.sh"
-        test_path = seed_path / "tests" / "test_outputs.py"
+        Args:
+            system_prompt: System prompt from prepare_prefix
+            user_prompt_prefix: Seed-invariant user prompt from prepare_prefix
+            variation_prompt: Optional specific variation request
 
-        logger.info("[TaskGenerator] Loading seed task files...")
-        # Load seed task content
-        with open(task_yaml_path) as f:
-            seed_task_yaml = yaml.safe_load(f)
-
-        with open(dockerfile_path) as f:
-            seed_dockerfile = f.read()
-
-        with open(solution_path) as f:
-            seed_solution = f.read()
-
-        with open(test_path) as f:
-            seed_test = f.read()
-
-        logger.info("[TaskGenerator] Building prompts...")
-        # Build the prompt
-        system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(
-            seed_task_yaml=seed_task_yaml,
-            seed_dockerfile=seed_dockerfile,
-            seed_solution=seed_solution,
-            seed_test=seed_test,
-            variation_prompt=variation_prompt,
-        )
+        Returns:
+            GeneratedTask with all required files
+        """
+        # Only the variation tail is built per call
+        user_prompt = user_prompt_prefix + self._build_variation_tail(variation_prompt)
 
-        logger.info(f"[TaskGenerator] Calling OpenAI model: {self.model}")
-        logger.info(f"[TaskGenerator] Prompt length: {len(user_prompt)} chars")
+        # This runs once per generated task; skip the f-string formatting
+        # entirely when INFO logging is off
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info(f"[TaskGenerator] Calling OpenAI model: {self.model}")
+            logger.info(f"[TaskGenerator] Prompt length: {len(user_prompt)} chars")
 
         try:
-            # Call OpenAI Responses API with structured outputs
-            response = await self.client.responses.parse(
-                model=self.model,
-                input=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                text_format=GeneratedTask,
-                parallel_tool_calls=True,
-                reasoning={"effort": "minimal"},
-                timeout=120.0,
-            )
-            logger.info("[TaskGenerator] OpenAI response received")
+            # Call OpenAI Responses API with structured outputs; transient
+            # API errors and timeouts are retried with jittered backoff
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type((APIError, APITimeoutError)),
+                wait=wait_exponential_jitter(initial=0.5, max=8),
+                stop=stop_after_attempt(3),
+                reraise=True,
+            ):
+                with attempt:
+                    response = await self.client.responses.parse(
+                        model=self.model,
+                        input=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        text_format=GeneratedTask,
+                        reasoning={"effort": "minimal"},
+                        timeout=120.0,
+                    )
+            if log_info:
+                logger.info("[TaskGenerator] OpenAI response received")
         except Exception as e:
             logger.error(f"[TaskGenerator] LLM call failed: {type(e).__name__}: {str(e)}")
             raise
 
         # Extract structured output from Responses API
-        logger.info("[TaskGenerator] Parsing response...")
+        if log_info:
+            logger.info("[TaskGenerator] Parsing response...")
         generated_task = response.output_parsed
 
         if generated_task is None:
             raise ValueError("Failed to parse response: output_parsed is None")
 
-        logger.info(f"[TaskGenerator] Task generated successfully: {generated_task.task_name}")
+        if log_info:
+            logger.info(f"[TaskGenerator] Task generated successfully: {generated_task.task_name}")
         return generated_task
 
     def _build_system_prompt(self) -> str:
@@ -129,50 +276,38 @@ When generating task variations:
 - Ensure the new task is sufficiently different but equally challenging
 - Keep the same testing methodology (pytest-based)"""
 
-    def _build_user_prompt(
-        self,
-        seed_task_yaml: dict,
-        seed_dockerfile: str,
-        seed_solution: str,
-        seed_test: str,
-        variation_prompt: str | None = None,
-    ) -> str:
-        """Build the user prompt with seed task content."""
-
-        variation_instruction = (
-            variation_prompt
-            if variation_prompt
-            else "Generate a unique task variation. Think creatively about different tools, APIs, or approaches."
-        )
+    def _build_user_prompt_prefix(self, seed: SeedBundle) -> str:
+        """Build the seed-invariant part of the user prompt.
 
+        Everything here is identical for all variations of one seed; the
+        per-task variation request is appended by _build_variation_tail,
+        keeping this span cacheable by the LLM provider.
+        """
         return f"""Based on the following seed task, generate a new programming task variation.
 
 SEED TASK YAML:
 ```yaml
-{yaml.dump(seed_task_yaml, default_flow_style=False)}
+{seed.yaml_dump_str}
 ```
 
 SEED DOCKERFILE:
 ```dockerfile
-{seed_dockerfile}
+{seed.dockerfile}
 ```
 
 SEED SOLUTION (solution.sh):
 ```bash
-{seed_solution}
+{seed.solution}
 ```
 
 SEED TEST (tests/test_outputs.py):
 ```python
-{seed_test}
+{seed.test}
 ```
 
-VARIATION REQUEST:
-{variation_instruction}
-
 Generate a complete new task that:
 1. Uses a DIFFERENT API, tool, or technology (not agentmail.to, and DIFFERENT from the seed task)
-2. Maintains the SAME difficulty level ({seed_task_yaml.get('difficulty', 'medium')})
+2. Maintains the SAME difficulty level ({seed.task_yaml.get('difficulty', 'medium')})
 3. Follows the SAME structure and quality standards
 4. Includes complete, working Dockerfile, solution, and tests
 5. Has a UNIQUE and DESCRIPTIVE task_name that reflects the specific API/tool used
@@ -180,8 +315,6 @@ Generate a complete new task that:
 
 The generated task should be production-ready and immediately usable for evaluation.
 
-CRITICAL: Generate a UNIQUE task_name based on the variation request!
-
 IMPORTANT GUIDELINES:
 - For task_name: MUST be descriptive and unique based on the variation request
   Examples:
@@ -192,7 +325,22 @@ IMPORTANT GUIDELINES:
 - For solution_script: use heredoc (cat <<'EOF' > /home/tbuser/script.py) to create the Python script
 - For test_file_content: write comprehensive pytest tests similar to the seed task
 - For docker_compose: include client service with proper volume mounts and environment variables
-- Ensure the instruction field is detailed with all sections: Environment Setup, Core Functionality, Code Quality Requirements, Testing Compatibility, Constraints, and Success Criteria"""
+- Ensure the instruction field is detailed with all sections: Environment Setup, Core Functionality, Code Quality Requirements, Testing Compatibility, Constraints, and Success Criteria
+"""
+
+    def _build_variation_tail(self, variation_prompt: str | None = None) -> str:
+        """Build the per-task variation request appended after the prefix."""
+        variation_instruction = (
+            variation_prompt
+            if variation_prompt
+            else "Generate a unique task variation. Think creatively about different tools, APIs, or approaches."
+        )
+
+        return f"""
+VARIATION REQUEST:
+{variation_instruction}
+
+CRITICAL: Generate a UNIQUE task_name based on the variation request!"""
 
     async def generate_batch(self, seed_task_path: str, num_tasks: int = 10) -> list[GeneratedTask]:
         """
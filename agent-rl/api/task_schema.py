@@ -2,12 +2,19 @@
 Pydantic models for structured task generation outputs.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+# Instances are built once per generated task and never mutated, so the
+# models are frozen (skips assignment machinery, makes them hashable)
+# and reject unexpected fields outright.
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="forbid")
 
 
 class TaskYAML(BaseModel):
     """Task YAML configuration model."""
 
+    model_config = _MODEL_CONFIG
+
     instruction: str = Field(
         description="Detailed multi-line task instruction including environment setup, core functionality, code quality requirements, testing compatibility, constraints, and success criteria"
     )
@@ -34,6 +41,8 @@ class TaskYAML(BaseModel):
 class GeneratedTask(BaseModel):
     """Complete generated task with all required files."""
 
+    model_config = _MODEL_CONFIG
+
     task_name: str = Field(
         description="Unique task identifier (e.g., email-automation-agentmail, file-encryption-gpg)"
     )
@@ -55,9 +64,22 @@ class GeneratedTask(BaseModel):
     )
 
 
+def load_generated_task(raw: bytes | str) -> GeneratedTask:
+    """
+    Parse and validate a serialized task in one pass.
+
+    Canonical entrypoint for reading task JSON: pydantic-core's Rust
+    parser validates straight from the bytes, skipping the intermediate
+    json.loads dict.
+    """
+    return GeneratedTask.model_validate_json(raw)
+
+
 class TaskGenerationRequest(BaseModel):
     """Request model for task generation."""
 
+    model_config = _MODEL_CONFIG
+
     num_tasks: int = Field(default=10, ge=1, le=100, description="Number of tasks to generate")
     seed_task_name: str | None = Field(
         default=None, description="Name of the seed task to base generation on"
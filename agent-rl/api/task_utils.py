@@ -15,12 +15,71 @@ Usage:
 
 import argparse
 import json
-import shutil
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
 
 import yaml
 
+from task_schema import GeneratedTask, load_generated_task
+
+try:
+    # libyaml-backed loader/dumper; the pure-Python ones are ~40x slower
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # C-accelerated JSON; several times faster than stdlib on the
+    # multi-KB task blobs this script shuffles around
+    import orjson
+except ImportError:  # pragma: no cover - environments without orjson
+    orjson = None
+
+# Below this size the buffered read is cheaper than mmap's
+# page-granularity setup
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _load_task_json(json_path: Path) -> GeneratedTask:
+    """
+    Parse and validate a task JSON file.
+
+    Typical task files go straight through load_generated_task, which
+    parses and validates in one pass in pydantic-core's Rust parser.
+    Files large enough to mmap are parsed zero-copy by orjson from the
+    page cache first and validated from the resulting dict.
+    """
+    if orjson is not None and json_path.stat().st_size >= _MMAP_MIN_SIZE:
+        fd = os.open(json_path, os.O_RDONLY)
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            try:
+                return GeneratedTask.model_validate(orjson.loads(memoryview(mm)))
+            finally:
+                mm.close()
+        finally:
+            os.close(fd)
+
+    return load_generated_task(json_path.read_bytes())
+
+
+@lru_cache(maxsize=8192)
+def _enc(s: str) -> bytes:
+    """
+    Encode a string to UTF-8, caching by content.
+
+    Batch expansions repeat a lot of text verbatim (run-tests.sh
+    templates, boilerplate Dockerfiles, shared author fields), so
+    identical bodies are encoded once per process. Each process-pool
+    worker keeps its own cache.
+    """
+    return s.encode("utf-8")
+
 
 def expand_json_to_files(json_path: Path, output_dir: Path) -> None:
     """
@@ -30,38 +89,25 @@ def expand_json_to_files(json_path: Path, output_dir: Path) -> None:
         json_path: Path to the task JSON file
         output_dir: Directory to create the task files in
     """
-    with open(json_path, "r") as f:
-        task_data = json.load(f)
-    
-    # Create output directory
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Write task.yaml
-    with open(output_dir / "task.yaml", "w") as f:
-        yaml.dump(task_data["task_yaml"], f, default_flow_style=False)
-    
-    # Write Dockerfile
-    with open(output_dir / "Dockerfile", "w") as f:
-        f.write(task_data["dockerfile"])
-    
-    # Write docker-compose.yaml
-    with open(output_dir / "docker-compose.yaml", "w") as f:
-        f.write(task_data["docker_compose"])
-    
-    # Write solution.sh
-    with open(output_dir / "solution.sh", "w") as f:
-        f.write(task_data["solution_script"])
-    
-    # Write run-tests.sh
-    with open(output_dir / "run-tests.sh", "w") as f:
-        f.write(task_data["run_tests_script"])
-    
-    # Create tests directory and write test file
+    task = _load_task_json(Path(json_path))
+
+    # One mkdir covers output_dir and the tests subdirectory
     tests_dir = output_dir / "tests"
-    tests_dir.mkdir(exist_ok=True)
-    with open(tests_dir / "test_outputs.py", "w") as f:
-        f.write(task_data["test_file_content"])
-    
+    tests_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write task.yaml (the only file that needs re-serialization)
+    with open(output_dir / "task.yaml", "w") as f:
+        yaml.dump(task.task_yaml.model_dump(), f, Dumper=_YamlDumper, default_flow_style=False)
+
+    # The rest are verbatim contents: pre-encode once and write each
+    # file in a single write_bytes call instead of an open/write/close
+    # context per file
+    (output_dir / "Dockerfile").write_bytes(_enc(task.dockerfile))
+    (output_dir / "docker-compose.yaml").write_bytes(_enc(task.docker_compose))
+    (output_dir / "solution.sh").write_bytes(_enc(task.solution_script))
+    (output_dir / "run-tests.sh").write_bytes(_enc(task.run_tests_script))
+    (tests_dir / "test_outputs.py").write_bytes(_enc(task.test_file_content))
+
     print(f"✅ Expanded {json_path.name} to {output_dir}")
     print(f"   Created 6 files + tests/ directory")
 
@@ -81,36 +127,28 @@ def compress_files_to_json(task_dir: Path, output_json: Path) -> None:
     solution_path = task_dir / "solution.sh"
     run_tests_path = task_dir / "run-tests.sh"
     test_file_path = task_dir / "tests" / "test_outputs.py"
-    
-    # Validate all files exist
-    required_files = [
-        task_yaml_path, dockerfile_path, docker_compose_path,
-        solution_path, run_tests_path, test_file_path
-    ]
-    
-    for file_path in required_files:
-        if not file_path.exists():
-            raise FileNotFoundError(f"Required file not found: {file_path}")
+
+    # Validate all files exist: one scandir pass per directory instead
+    # of a stat syscall per required file
+    entries = {entry.name for entry in os.scandir(task_dir)}
+    for name in ("task.yaml", "Dockerfile", "docker-compose.yaml", "solution.sh", "run-tests.sh"):
+        if name not in entries:
+            raise FileNotFoundError(f"Required file not found: {task_dir / name}")
+
+    if "tests" not in entries or "test_outputs.py" not in {
+        entry.name for entry in os.scandir(task_dir / "tests")
+    }:
+        raise FileNotFoundError(f"Required file not found: {test_file_path}")
     
     # Load task.yaml
-    with open(task_yaml_path, "r") as f:
-        task_yaml = yaml.safe_load(f)
-    
-    # Read all file contents
-    with open(dockerfile_path, "r") as f:
-        dockerfile = f.read()
-    
-    with open(docker_compose_path, "r") as f:
-        docker_compose = f.read()
-    
-    with open(solution_path, "r") as f:
-        solution_script = f.read()
-    
-    with open(run_tests_path, "r") as f:
-        run_tests_script = f.read()
-    
-    with open(test_file_path, "r") as f:
-        test_file_content = f.read()
+    task_yaml = yaml.load(task_yaml_path.read_bytes(), Loader=_YamlLoader)
+
+    # Read all file contents: single-syscall byte reads, decoded once
+    dockerfile = dockerfile_path.read_bytes().decode()
+    docker_compose = docker_compose_path.read_bytes().decode()
+    solution_script = solution_path.read_bytes().decode()
+    run_tests_script = run_tests_path.read_bytes().decode()
+    test_file_content = test_file_path.read_bytes().decode()
     
     # Create JSON structure
     task_json = {
@@ -122,40 +160,66 @@ def compress_files_to_json(task_dir: Path, output_json: Path) -> None:
         "run_tests_script": run_tests_script,
         "test_file_content": test_file_content,
     }
-    
-    # Save JSON
-    with open(output_json, "w") as f:
-        json.dump(task_json, f, indent=2)
+
+    # Validate against the task schema before writing, so malformed
+    # task dirs fail here instead of downstream in the pipeline
+    GeneratedTask.model_validate(task_json)
+    
+    # Save JSON: serialize in C and hand the writer one coalesced buffer
+    if orjson is not None:
+        with open(output_json, "wb", buffering=64 * 1024) as f:
+            f.write(orjson.dumps(task_json, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_json, "w") as f:
+            json.dump(task_json, f, indent=2)
     
     print(f"✅ Compressed {task_dir} to {output_json}")
     print(f"   JSON size: {output_json.stat().st_size / 1024:.1f} KB")
 
 
+def _expand_one(task: tuple) -> str:
+    """
+    Expand a single task JSON (process-pool worker).
+
+    Args:
+        task: (json_file, task_output_dir) pair
+
+    Returns:
+        An error message on failure, empty string on success
+    """
+    json_file, task_output_dir = task
+    try:
+        expand_json_to_files(json_file, task_output_dir)
+        return ""
+    except Exception as e:
+        return f"❌ Failed to expand {json_file.name}: {e}"
+
+
 def expand_all_jsons(json_dir: Path, output_dir: Path) -> None:
     """
     Expand all JSON files in a directory to file structures.
-    
+
+    Each expansion is independent, so files are distributed across a
+    process pool for near-linear speedup on multi-core hardware.
+
     Args:
         json_dir: Directory containing task JSON files
         output_dir: Base directory to create task directories in
     """
     json_files = list(json_dir.glob("*.json"))
-    
+
     if not json_files:
         print(f"❌ No JSON files found in {json_dir}")
         return
-    
+
     print(f"📦 Found {len(json_files)} JSON files to expand")
-    
-    for json_file in json_files:
-        task_name = json_file.stem  # filename without .json
-        task_output_dir = output_dir / task_name
-        
-        try:
-            expand_json_to_files(json_file, task_output_dir)
-        except Exception as e:
-            print(f"❌ Failed to expand {json_file.name}: {e}")
-    
+
+    tasks = [(json_file, output_dir / json_file.stem) for json_file in json_files]
+    with ProcessPoolExecutor() as executor:
+        for error in executor.map(_expand_one, tasks, chunksize=4):
+            if error:
+                print(error)
+
     print(f"\n✅ Expanded {len(json_files)} tasks to {output_dir}")
 
 
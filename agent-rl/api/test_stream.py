@@ -3,9 +3,44 @@ Test script for the streaming API (SSE-based).
 Demonstrates real-time task generation with Server-Sent Events.
 """
 
-import json
-
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+
+
+def _handle_start(data: dict) -> None:
+    print(f"   🎨 {data.get('message')} (Total: {data.get('total')} tasks)")
+
+
+def _handle_progress(data: dict) -> None:
+    print(f"   [{data.get('current')}/{data.get('total')}] {data.get('message')}")
+
+
+def _handle_success(data: dict) -> None:
+    task = data.get("task", {})
+    print(f"   ✅ {task.get('name')} ({task.get('difficulty')}) - {task.get('category')}")
+
+
+def _handle_error(data: dict) -> None:
+    print(f"   ❌ {data.get('message')}")
+
+
+def _handle_complete(data: dict) -> None:
+    print(f"\n   🎉 {data.get('message')} ({data.get('generated')}/{data.get('total')} tasks)")
+
+
+def _handle_default(data: dict) -> None:
+    print(f"   {data.get('message', '')}")
+
+
+# Dispatch table replaces the per-event if/elif chain
+_HANDLERS = {
+    "start": _handle_start,
+    "progress": _handle_progress,
+    "success": _handle_success,
+    "error": _handle_error,
+    "complete": _handle_complete,
+}
 
 
 def test_stream_generation():
@@ -16,9 +51,14 @@ def test_stream_generation():
     print("Testing Streaming API")
     print("=" * 60)
 
+    # One keep-alive session for both calls, so the stream rides the
+    # TCP connection the scenario submission already opened
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
     # Step 1: Submit scenario
     print("\n1. Submitting scenario...")
-    response = requests.post(
+    response = session.post(
         f"{API_BASE}/submit-scenario",
         json={"scenario": "Create API integration tasks"},
     )
@@ -26,7 +66,7 @@ def test_stream_generation():
 
     # Step 2: Start streaming generation
     print("\n2. Starting streaming task generation...")
-    response = requests.post(
+    response = session.post(
         f"{API_BASE}/generate-tasks-stream",
         json={"num_tasks": 2, "model": "gpt-5"},
         stream=True,  # Enable streaming
@@ -38,38 +78,18 @@ def test_stream_generation():
 
     print("\n3. Receiving real-time progress updates:\n")
 
-    # Process SSE stream
-    for line in response.iter_lines():
-        if line:
-            line = line.decode("utf-8")
-            if line.startswith("data: "):
-                data_str = line[6:]  # Remove "data: " prefix
-                try:
-                    data = json.loads(data_str)
-                    msg_type = data.get("type", "unknown")
-                    message = data.get("message", "")
-
-                    # Format output based on type
-                    if msg_type == "start":
-                        print(f"   🎨 {message} (Total: {data.get('total')} tasks)")
-                    elif msg_type == "progress":
-                        print(f"   [{data.get('current')}/{data.get('total')}] {message}")
-                    elif msg_type == "success":
-                        task = data.get("task", {})
-                        print(
-                            f"   ✅ {task.get('name')} ({task.get('difficulty')}) - {task.get('category')}"
-                        )
-                    elif msg_type == "error":
-                        print(f"   ❌ {message}")
-                    elif msg_type == "complete":
-                        print(
-                            f"\n   🎉 {message} ({data.get('generated')}/{data.get('total')} tasks)"
-                        )
-                    else:
-                        print(f"   {message}")
-
-                except json.JSONDecodeError:
-                    print(f"   [RAW] {data_str}")
+    # Process SSE stream: parse the raw bytes directly with orjson and
+    # dispatch on event type through the handler table
+    for raw in response.iter_lines(chunk_size=8192):
+        if raw.startswith(b"data: "):
+            payload = raw[6:]  # Remove "data: " prefix
+            try:
+                data = orjson.loads(payload)
+            except orjson.JSONDecodeError:
+                print(f"   [RAW] {payload.decode('utf-8', errors='replace')}")
+                continue
+
+            _HANDLERS.get(data.get("type"), _handle_default)(data)
 
     print("\n" + "=" * 60)
     print("✅ Streaming completed!")
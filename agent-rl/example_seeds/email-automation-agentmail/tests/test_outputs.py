@@ -7,12 +7,46 @@ the agentmail.to API.
 """
 
 import os
+import re
 import sys
 import importlib.util
 import inspect
 from pathlib import Path
 import pytest
 
+# Compiled once at import so the hardcoded-key test scans the script
+# bytes in a single pass (agentmail keys start with am_)
+_HARDCODED_KEY_RE = re.compile(rb"api_key\s*=\s*['\"]am_")
+
+
+@pytest.fixture(scope="module")
+def email_automation_mod():
+    """
+    Load and execute email_automation.py once for the whole module.
+
+    Parsing, compiling, and executing the user's script (which imports
+    the agentmail SDK) is the expensive part of these tests, so it
+    happens a single time here and the already-executed module is shared
+    by every test that inspects it.
+    """
+    script_path = "/home/tbuser/email_automation.py"
+    spec = importlib.util.spec_from_file_location("email_automation", script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["email_automation"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def email_automation_source():
+    """
+    Read the email_automation.py source once for the whole module.
+
+    The scanning tests only need the raw bytes, so the file is read
+    from disk a single time, undecoded, and shared.
+    """
+    return Path("/home/tbuser/email_automation.py").read_bytes()
+
 
 def test_script_exists():
     """
@@ -34,6 +68,9 @@ def test_imports_successfully():
     - The agentmail package is installed
     - The email_automation.py script has valid Python syntax
     - The script can be imported as a module
+
+    This is the only test that performs its own import, so that import
+    failures are reported with a clear diagnostic instead of a fixture error.
     """
     # Test agentmail SDK availability
     try:
@@ -55,7 +92,7 @@ def test_imports_successfully():
         pytest.fail(f"Failed to import email_automation module: {e}")
 
 
-def test_required_functions_exist():
+def test_required_functions_exist(email_automation_mod):
     """
     Test that all required functions are implemented in the script.
 
@@ -64,21 +101,15 @@ def test_required_functions_exist():
     - send_email(client, inbox_id, to_email, subject, body)
     - format_email_summary(inbox_obj)
     """
-    script_path = "/home/tbuser/email_automation.py"
-    spec = importlib.util.spec_from_file_location("email_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["email_automation"] = module
-    spec.loader.exec_module(module)
-
     required_functions = ["create_inbox", "send_email", "format_email_summary"]
 
     for func_name in required_functions:
-        assert hasattr(module, func_name), f"Function '{func_name}' not found in email_automation.py"
-        func = getattr(module, func_name)
+        assert hasattr(email_automation_mod, func_name), f"Function '{func_name}' not found in email_automation.py"
+        func = getattr(email_automation_mod, func_name)
         assert callable(func), f"'{func_name}' is not callable"
 
 
-def test_function_signatures():
+def test_function_signatures(email_automation_mod):
     """
     Test that functions have the correct parameter signatures.
 
@@ -87,73 +118,55 @@ def test_function_signatures():
     - send_email accepts correct parameters (client, inbox_id, to_email, subject, body)
     - format_email_summary accepts 'inbox_obj' parameter
     """
-    script_path = "/home/tbuser/email_automation.py"
-    spec = importlib.util.spec_from_file_location("email_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["email_automation"] = module
-    spec.loader.exec_module(module)
-
     # Test create_inbox signature
-    create_inbox_sig = inspect.signature(module.create_inbox)
+    create_inbox_sig = inspect.signature(email_automation_mod.create_inbox)
     assert "client" in create_inbox_sig.parameters, "create_inbox must have 'client' parameter"
 
     # Test send_email signature
-    send_email_sig = inspect.signature(module.send_email)
+    send_email_sig = inspect.signature(email_automation_mod.send_email)
     required_params = ["client", "inbox_id", "to_email", "subject", "body"]
     for param in required_params:
         assert param in send_email_sig.parameters, f"send_email must have '{param}' parameter"
 
     # Test format_email_summary signature
-    format_sig = inspect.signature(module.format_email_summary)
+    format_sig = inspect.signature(email_automation_mod.format_email_summary)
     assert "inbox_obj" in format_sig.parameters, "format_email_summary must have 'inbox_obj' parameter"
 
 
-def test_functions_have_docstrings():
+def test_functions_have_docstrings(email_automation_mod):
     """
     Test that all required functions have docstrings for documentation.
 
     Good code practices require documenting functions with docstrings
     that explain what the function does, its parameters, and return values.
     """
-    script_path = "/home/tbuser/email_automation.py"
-    spec = importlib.util.spec_from_file_location("email_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["email_automation"] = module
-    spec.loader.exec_module(module)
-
     required_functions = ["create_inbox", "send_email", "format_email_summary"]
 
     for func_name in required_functions:
-        func = getattr(module, func_name)
+        func = getattr(email_automation_mod, func_name)
         assert func.__doc__ is not None, f"Function '{func_name}' must have a docstring"
         assert len(func.__doc__.strip()) > 0, f"Function '{func_name}' docstring is empty"
 
 
-def test_type_hints_present():
+def test_type_hints_present(email_automation_mod):
     """
     Test that functions use type hints for parameters and return values.
 
     Type hints improve code readability and enable static type checking.
     This test verifies that the main functions have type annotations.
     """
-    script_path = "/home/tbuser/email_automation.py"
-    spec = importlib.util.spec_from_file_location("email_automation", script_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["email_automation"] = module
-    spec.loader.exec_module(module)
-
     # Check type hints for send_email
-    send_email_sig = inspect.signature(module.send_email)
+    send_email_sig = inspect.signature(email_automation_mod.send_email)
     assert send_email_sig.return_annotation != inspect.Parameter.empty, \
         "send_email must have a return type hint"
 
     # Check type hints for format_email_summary
-    format_sig = inspect.signature(module.format_email_summary)
+    format_sig = inspect.signature(email_automation_mod.format_email_summary)
     assert format_sig.return_annotation != inspect.Parameter.empty, \
         "format_email_summary must have a return type hint"
 
 
-def test_no_hardcoded_api_keys():
+def test_no_hardcoded_api_keys(email_automation_source):
     """
     Test that the script does not contain hardcoded API keys.
 
@@ -161,27 +174,22 @@ def test_no_hardcoded_api_keys():
     variables, not hardcoded in the script. This test checks that the
     string 'AGENTMAIL_API_KEY' appears in the script (indicating proper
     environment variable usage) and that suspicious patterns like
-    'api_key = "' with a long string do not appear.
+    'api_key = "' with a long string do not appear. The pattern is
+    precompiled at module scope and runs over the raw bytes in one pass.
     """
-    script_path = Path("/home/tbuser/email_automation.py")
-    content = script_path.read_text()
+    content = email_automation_source
 
     # Should reference environment variable
-    assert "AGENTMAIL_API_KEY" in content, \
+    assert b"AGENTMAIL_API_KEY" in content, \
         "Script must reference AGENTMAIL_API_KEY environment variable"
 
     # Check for common hardcoding patterns
-    suspicious_patterns = [
-        'api_key = "am_',  # agentmail keys start with am_
-        "api_key = 'am_",
-    ]
+    match = _HARDCODED_KEY_RE.search(content)
+    assert match is None, \
+        f"Potential hardcoded API key detected: '{match.group(0).decode()}' found in script"
 
-    for pattern in suspicious_patterns:
-        assert pattern not in content, \
-            f"Potential hardcoded API key detected: '{pattern}' found in script"
 
-
-def test_script_is_importable():
+def test_script_is_importable(email_automation_source):
     """
     Test that the script can be imported without executing the main block.
 
@@ -189,8 +197,7 @@ def test_script_is_importable():
     main execution code, allowing functions to be imported and tested
     independently without side effects.
     """
-    script_path = Path("/home/tbuser/email_automation.py")
-    content = script_path.read_text()
+    content = email_automation_source
 
-    assert 'if __name__ == "__main__"' in content or "if __name__ == '__main__'" in content, \
+    assert b'if __name__ == "__main__"' in content or b"if __name__ == '__main__'" in content, \
         "Script must use 'if __name__ == \"__main__\":' guard for main execution block"
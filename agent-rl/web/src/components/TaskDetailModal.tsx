@@ -25,6 +25,8 @@ interface Task {
   tags: string[]
   instruction: string
   json_path: string
+  json_filename: string
+  // Fetched on demand by the panel; tabs show placeholders until it arrives
   task_json?: TaskJson
 }
 
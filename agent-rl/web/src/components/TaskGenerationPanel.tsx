@@ -25,6 +25,9 @@ interface Task {
   tags: string[]
   instruction: string
   json_path: string
+  json_filename: string
+  // Full body, fetched on demand from /api/tasks/{json_filename} and
+  // cached here (SSE success events carry metadata only)
   task_json?: TaskJson
 }
 
@@ -143,9 +146,34 @@ export function TaskGenerationPanel({ onContinue, scenarioSubmitted, config }: T
     }
   }, [config])
 
-  const handleDownloadAll = () => {
+  const fetchTaskJson = useCallback(async (task: Task): Promise<TaskJson | undefined> => {
+    // SSE success events only carry metadata; the full body lives on
+    // the server and is fetched (then cached on the task) when needed
+    if (task.task_json) {
+      return task.task_json
+    }
+    try {
+      const response = await fetch(`http://localhost:8000/api/tasks/${task.json_filename}`)
+      if (!response.ok) {
+        throw new Error(`Failed to fetch task JSON (${response.status})`)
+      }
+      const taskJson: TaskJson = await response.json()
+      setTasks(prev => prev.map(t => (t.id === task.id ? { ...t, task_json: taskJson } : t)))
+      return taskJson
+    } catch (error) {
+      console.error('Failed to load task JSON:', error)
+      setLogs(prev => [...prev, `❌ Failed to load ${task.name}: ${error}`])
+      return undefined
+    }
+  }, [])
+
+  const handleDownloadAll = async () => {
     // Download as JSONL (one JSON object per line)
-    const jsonl = tasks.map(task => JSON.stringify(task.task_json || task)).join('\n')
+    const bodies = await Promise.all(tasks.map(task => fetchTaskJson(task)))
+    const jsonl = bodies
+      .filter((body): body is TaskJson => body !== undefined)
+      .map(body => JSON.stringify(body))
+      .join('\n')
     const blob = new Blob([jsonl], { type: 'application/jsonl' })
     const url = URL.createObjectURL(blob)
     const a = document.createElement('a')
@@ -157,8 +185,12 @@ export function TaskGenerationPanel({ onContinue, scenarioSubmitted, config }: T
     URL.revokeObjectURL(url)
   }
 
-  const handleDownloadTask = (task: Task) => {
-    const blob = new Blob([JSON.stringify(task.task_json || task, null, 2)], { type: 'application/json' })
+  const handleDownloadTask = async (task: Task) => {
+    const taskJson = await fetchTaskJson(task)
+    if (!taskJson) {
+      return
+    }
+    const blob = new Blob([JSON.stringify(taskJson, null, 2)], { type: 'application/json' })
     const url = URL.createObjectURL(blob)
     const a = document.createElement('a')
     a.href = url
@@ -169,9 +201,15 @@ export function TaskGenerationPanel({ onContinue, scenarioSubmitted, config }: T
     URL.revokeObjectURL(url)
   }
 
-  const handleViewTask = (task: Task) => {
+  const handleViewTask = async (task: Task) => {
+    // Open immediately with metadata; the modal shows placeholders
+    // until the body arrives
     setSelectedTask(task)
     setModalOpen(true)
+    const taskJson = await fetchTaskJson(task)
+    if (taskJson) {
+      setSelectedTask(prev => (prev && prev.id === task.id ? { ...prev, task_json: taskJson } : prev))
+    }
   }
 
   return (